@@ -10,58 +10,269 @@ functions for use from Node.js. It supports:
 - Token authentication
 - Custom cache directories
 - Resume/pause support via chunk management
+- Long-running mode serving JSON commands over stdin
 
 Usage:
     python hf_download.py --repo-id "repo/name" --filename "file.bin" [--dest "path"]
     python hf_download.py --repo-id "repo/name" --snapshot [--dest "path"]
+    python hf_download.py --serve
 """
 
 import sys
 import json
+import fnmatch
+import functools
+import importlib.util
+import inspect
 import os
+import re
+import time
+import atexit
 import argparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-# Try importing huggingface_hub
+# Whether huggingface_hub is installed, detected without importing it
+HF_AVAILABLE = importlib.util.find_spec("huggingface_hub") is not None
+
+# huggingface_hub is imported lazily by _load_hf() so modes that don't need it
+# (e.g. --check) start quickly; the module is then kept for --serve sessions
+_hf = None
+
+# Network errors worth retrying, populated once requests is imported
+_retryable_errors = ()
+
+
+def _load_hf():
+    """Import huggingface_hub on first use and configure its HTTP backend."""
+    global _hf, _retryable_errors
+    if _hf is not None:
+        return _hf
+
+    # Enable the Rust-based hf_transfer accelerator when it is installed. It
+    # splits each file into parallel range requests, which saturates fast links
+    # far better than the pure-Python downloader, at the cost of higher
+    # memory/CPU use and less granular error reporting. Must be set before
+    # huggingface_hub is imported.
+    if importlib.util.find_spec("hf_transfer") is not None:
+        os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+    try:
+        import huggingface_hub
+        import huggingface_hub.constants
+        import huggingface_hub.file_download
+        import huggingface_hub.utils
+    except ImportError:
+        sys.stderr.write("ERROR: huggingface_hub is not installed. Install it with:\n")
+        sys.stderr.write("  pip install huggingface_hub\n")
+        sys.exit(1)
+
+    # Share one pooled requests.Session across all Hub calls in this process so
+    # repeated downloads/metadata lookups reuse TCP+TLS connections. Newer
+    # huggingface_hub releases (httpx-based) don't expose configure_http_backend.
+    configure_http_backend = getattr(huggingface_hub, "configure_http_backend", None)
+    try:
+        import requests
+        _retryable_errors = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    except ImportError:
+        configure_http_backend = None
+    if configure_http_backend is not None:
+        configure_http_backend(backend_factory=_backend_factory)
+
+    _hf = huggingface_hub
+    return _hf
+
+
+def _backend_factory():
+    """
+    Build the pooled session used by huggingface_hub.
+
+    Mirrors huggingface_hub's default factory (offline guard, request-ID
+    adapter) with a larger connection pool. Older releases lack those private
+    adapters, so a plain pooled HTTPAdapter is used there. Retries are left to
+    _with_retries so there is a single retry layer.
+    """
+    import requests
+    from huggingface_hub import constants
+
+    try:
+        from huggingface_hub.utils._http import OfflineAdapter, UniqueRequestIdAdapter
+    except ImportError:
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    session = requests.Session()
+    if constants.HF_HUB_OFFLINE:
+        session.mount("http://", OfflineAdapter())
+        session.mount("https://", OfflineAdapter())
+    else:
+        adapter = UniqueRequestIdAdapter(pool_connections=16, pool_maxsize=32)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+    return session
+
+
+# Seconds to wait for the metadata (HEAD) request before giving up
+ETAG_TIMEOUT = 30
+
+# Default number of concurrent file transfers for snapshot downloads
+DEFAULT_MAX_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+
+# In-process retries for transient network failures, with exponential backoff
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Persistent metadata manifest stored in the cache directory
+MANIFEST_FILENAME = ".hf_meta.json"
+MANIFEST_MAX_ENTRIES = 4096
+MANIFEST_TTL = 6 * 60 * 60  # 6 hours
+
+
+# Prefer orjson (faster, encodes straight to bytes); fall back to stdlib json
 try:
-    from huggingface_hub import hf_hub_download, snapshot_download, hf_hub_url, HfFileSystem
-    from huggingface_hub.utils import tqdm as hf_tqdm
-    HF_AVAILABLE = True
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
 except ImportError:
-    HF_AVAILABLE = False
-    sys.stderr.write("ERROR: huggingface_hub is not installed. Install it with:\n")
-    sys.stderr.write("  pip install huggingface_hub\n")
-    sys.exit(1)
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+# Raw stdout byte stream; events are written as a single pre-encoded line each
+_OUT = sys.stdout.buffer
+
+
+def _emit(output):
+    """Write one JSON event line to stdout with a single write + flush."""
+    _OUT.write(_dumps(output) + b"\n")
+    _OUT.flush()
 
 
 def send_progress(event_type, data=None):
     """Send progress event as JSON to stdout."""
-    output = {
+    _emit({
         "type": event_type,
         "data": data or {}
-    }
-    print(json.dumps(output), flush=True)
+    })
 
 
 def send_error(message, code=None):
     """Send error event as JSON to stdout."""
-    output = {
+    _emit({
         "type": "error",
         "data": {
             "message": message,
             "code": code
         }
-    }
-    print(json.dumps(output), flush=True)
+    })
 
 
 def send_complete(result):
     """Send completion event as JSON to stdout."""
-    output = {
+    _emit({
         "type": "complete",
         "data": result
-    }
-    print(json.dumps(output), flush=True)
+    })
+
+
+class MetadataManifest:
+    """
+    Persistent cache of (repo_id, revision, filename) -> {etag, size}.
+
+    Each invocation of this script is a fresh process, so the manifest lets
+    later invocations reuse metadata fetched by earlier ones instead of
+    repeating the HEAD request. Entries expire after MANIFEST_TTL seconds and
+    the least recently used ones are evicted beyond MANIFEST_MAX_ENTRIES.
+    Changes are written back once, atomically, when the process exits.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = OrderedDict()
+        self.dirty = False
+
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if isinstance(data, dict):
+            self.entries.update(data)
+
+    @staticmethod
+    def _key(repo_id, revision, filename):
+        return f"{repo_id}@{revision}:{filename}"
+
+    def get(self, repo_id, revision, filename):
+        """Return the fresh entry for a file, or None if missing or expired."""
+        key = self._key(repo_id, revision, filename)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        if time.time() - entry.get("ts", 0) > MANIFEST_TTL:
+            del self.entries[key]
+            self.dirty = True
+            return None
+
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, repo_id, revision, filename, **fields):
+        """Record metadata for a file, evicting the oldest entries over the cap."""
+        key = self._key(repo_id, revision, filename)
+        entry = self.entries.pop(key, {})
+        entry.update(fields, ts=time.time())
+        self.entries[key] = entry
+
+        while len(self.entries) > MANIFEST_MAX_ENTRIES:
+            self.entries.popitem(last=False)
+        self.dirty = True
+
+    def save(self):
+        """Atomically write the manifest back if it changed."""
+        if not self.dirty:
+            return
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            # The manifest is only an optimization; never fail a download over it
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+_manifests = {}
+
+
+def _get_manifest(cache_dir=None):
+    """Return the process-wide manifest for a cache directory, loading it on first use."""
+    path = os.path.join(cache_dir or _load_hf().constants.HF_HUB_CACHE, MANIFEST_FILENAME)
+    manifest = _manifests.get(path)
+    if manifest is None:
+        if not _manifests:
+            atexit.register(_save_manifests)
+        manifest = _manifests[path] = MetadataManifest(path)
+    return manifest
+
+
+def _save_manifests():
+    """Persist every loaded manifest."""
+    for manifest in _manifests.values():
+        manifest.save()
 
 
 class ProgressReporter:
@@ -92,6 +303,136 @@ class ProgressReporter:
             self.last_report_time = now
 
 
+def _scan_files(path):
+    """
+    Yield a DirEntry for every non-directory entry under path.
+
+    Uses os.scandir so the stat data gathered while listing each directory can
+    be reused by callers. Symlinked directories are not followed.
+    """
+    if not os.path.isdir(path):
+        return
+
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    yield entry
+
+
+def _walk_size(path):
+    """
+    Count regular files under path and sum their sizes.
+
+    Reuses the stat data from os.scandir instead of issuing separate
+    exists/islink/getsize calls per file. Symlinks are skipped.
+
+    Returns:
+        Tuple of (file_count, total_size)
+    """
+    file_count = 0
+    total_size = 0
+    for entry in _scan_files(path):
+        if entry.is_file(follow_symlinks=False):
+            total_size += entry.stat(follow_symlinks=False).st_size
+            file_count += 1
+
+    return file_count, total_size
+
+
+def _mtime_ns(path):
+    """Modification time of path (following symlinks), or None if it is missing."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _files_modified_since(path, since):
+    """
+    List files under path modified at or after the given time.
+
+    Symlinks are followed so files stored as blobs in the hub cache are
+    included. Unreadable directories are skipped.
+    """
+    file_paths = []
+    try:
+        for entry in _scan_files(path):
+            if entry.is_file() and entry.stat().st_mtime >= since:
+                file_paths.append(entry.path)
+    except OSError:
+        pass
+    return file_paths
+
+
+def _drop_page_cache(file_path):
+    """
+    Advise the kernel that a file's cached pages are no longer needed.
+
+    DONTNEED skips pages that are still dirty. They are not flushed first,
+    because forcing multi-GB writes to disk would hold back the complete
+    event. Those pages become reclaimable once writeback has run.
+    """
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _release_page_cache(file_paths, max_workers=4):
+    """
+    Drop the page cache held by files downloaded in this call.
+
+    Downloading multi-GB weights leaves every written byte in the page cache,
+    competing for memory with the process that loads the model next. Only
+    files written by this call are touched, so pages other processes may be
+    using stay cached. No-op on platforms without posix_fadvise (macOS,
+    Windows).
+    """
+    if not file_paths or not hasattr(os, "posix_fadvise"):
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        executor.map(_drop_page_cache, file_paths)
+
+
+def _snapshot_size(repo_id, snapshot_path, revision="main", token=None,
+                   allow_patterns=None, ignore_patterns=None):
+    """
+    Compute file count and total size of a downloaded snapshot.
+
+    Sizes come from the repository metadata on the Hub, filtered with the
+    same patterns passed to snapshot_download, so no filesystem traversal is
+    needed and files symlinked into the hub cache are counted. Falls back to
+    walking snapshot_path when the metadata can't be fetched (e.g. offline).
+
+    Returns:
+        Tuple of (file_count, total_size)
+    """
+    hf = _load_hf()
+    try:
+        info = hf.HfApi(token=token).repo_info(repo_id, revision=revision, files_metadata=True)
+    except Exception:
+        return _walk_size(snapshot_path)
+
+    siblings = _filter_paths(
+        info.siblings or [],
+        allow_patterns=allow_patterns,
+        ignore_patterns=ignore_patterns,
+        key=lambda sibling: sibling.rfilename
+    )
+    return len(siblings), sum((sibling.size or 0) for sibling in siblings)
+
+
 def download_single_file(repo_id, filename, dest=None, revision="main", token=None, cache_dir=None, local_dir=None):
     """
     Download a single file from HuggingFace Hub.
@@ -115,11 +456,21 @@ def download_single_file(repo_id, filename, dest=None, revision="main", token=No
             "revision": revision
         })
 
+        # Skip the download entirely if the local copy is the one recorded in
+        # the manifest. No network is involved, so any failure here just falls
+        # through to hf_hub_download.
+        if local_dir:
+            current = _current_local_file(repo_id, filename, revision, local_dir, cache_dir)
+            if current is not None:
+                return _complete_single_file(repo_id, filename, current[0], current[1])
+
         # Build kwargs for hf_hub_download
         kwargs = {
             "repo_id": repo_id,
             "filename": filename,
             "revision": revision,
+            "etag_timeout": ETAG_TIMEOUT,
+            "force_download": False,
         }
 
         if token:
@@ -131,30 +482,131 @@ def download_single_file(repo_id, filename, dest=None, revision="main", token=No
             kwargs["local_dir_use_symlinks"] = False
 
         # Download the file
-        file_path = hf_hub_download(**kwargs)
+        file_path = _with_retries(_load_hf().hf_hub_download, **kwargs)
 
         # Get file size
         file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
 
-        send_complete({
-            "file_path": file_path,
-            "file_size": file_size,
-            "repo_id": repo_id,
-            "filename": filename
-        })
+        if local_dir:
+            _record_local_file(repo_id, filename, revision, local_dir, cache_dir, file_size)
 
-        return {
-            "file_path": file_path,
-            "file_size": file_size
-        }
+        return _complete_single_file(repo_id, filename, file_path, file_size)
 
     except Exception as e:
         send_error(str(e), type(e).__name__)
         raise
 
 
+def _is_retryable(error):
+    """
+    Whether a download error is a transient network/server failure.
+
+    HTTP errors are retried on transient status codes only. Errors without a
+    response (e.g. LocalEntryNotFoundError) are retried only when caused by a
+    connection error or timeout, and offline mode is never retried.
+    """
+    hf = _load_hf()
+    if isinstance(error, hf.utils.OfflineModeIsEnabled):
+        return False
+    if isinstance(error, hf.utils.HfHubHTTPError):
+        status = getattr(error.response, "status_code", None)
+        if status is not None:
+            return status in RETRYABLE_STATUS
+    if isinstance(error, _retryable_errors):
+        return True
+    return error.__cause__ is not None and _is_retryable(error.__cause__)
+
+
+def _with_retries(func, **kwargs):
+    """
+    Call func(**kwargs), retrying transient failures with exponential backoff.
+
+    Retrying here keeps the warm HTTP session and cache instead of failing the
+    whole invocation and making the caller spawn a new process.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return func(**kwargs)
+        except Exception as e:
+            if attempt == MAX_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_url(repo_id, filename, revision):
+    """Memoized hf_hub_url lookup."""
+    return _load_hf().hf_hub_url(repo_id, filename, revision=revision)
+
+
+def _read_local_metadata(local_dir, filename):
+    """
+    Read the download metadata huggingface_hub keeps for a file in local_dir.
+
+    hf_hub_download records the ETag and commit of every file it writes into
+    local_dir under .cache/huggingface/download/, and discards the record once
+    the file is modified. Returns None if there is no valid record or the
+    helper is unavailable in the installed huggingface_hub.
+    """
+    try:
+        from huggingface_hub._local_folder import read_download_metadata
+    except ImportError:
+        return None
+    return read_download_metadata(Path(local_dir), filename)
+
+
+def _current_local_file(repo_id, filename, revision, local_dir, cache_dir=None):
+    """
+    Check whether local_dir holds the copy of filename recorded in the manifest.
+
+    Returns:
+        Tuple of (file_path, file_size), or None if the file must be fetched
+    """
+    try:
+        file_path = os.path.join(local_dir, filename)
+        if not os.path.isfile(file_path):
+            return None
+        entry = _get_manifest(cache_dir).get(repo_id, revision, filename)
+        if entry is None:
+            return None
+        meta = _read_local_metadata(local_dir, filename)
+        if meta is None or meta.etag != entry["etag"]:
+            return None
+        file_size = os.path.getsize(file_path)
+        if file_size != entry["size"]:
+            return None
+        return file_path, file_size
+    except Exception:
+        return None
+
+
+def _record_local_file(repo_id, filename, revision, local_dir, cache_dir, file_size):
+    """Store the ETag and size of a file just downloaded into local_dir."""
+    try:
+        meta = _read_local_metadata(local_dir, filename)
+        if meta is not None and meta.etag:
+            _get_manifest(cache_dir).put(repo_id, revision, filename, etag=meta.etag, size=file_size)
+    except Exception:
+        pass
+
+
+def _complete_single_file(repo_id, filename, file_path, file_size):
+    """Emit the completion event for a single file download."""
+    send_complete({
+        "file_path": file_path,
+        "file_size": file_size,
+        "repo_id": repo_id,
+        "filename": filename
+    })
+
+    return {
+        "file_path": file_path,
+        "file_size": file_size
+    }
+
+
 def download_snapshot(repo_id, dest=None, revision="main", token=None, cache_dir=None,
-                     allow_patterns=None, ignore_patterns=None):
+                     allow_patterns=None, ignore_patterns=None, max_workers=DEFAULT_MAX_WORKERS, stat=False):
     """
     Download an entire repository snapshot from HuggingFace Hub.
 
@@ -166,6 +618,8 @@ def download_snapshot(repo_id, dest=None, revision="main", token=None, cache_dir
         cache_dir: Cache directory for downloaded files
         allow_patterns: List of glob patterns to include
         ignore_patterns: List of glob patterns to exclude
+        max_workers: Number of files to download concurrently
+        stat: Compute file_count and total_size (None otherwise)
 
     Returns:
         Dictionary with download results
@@ -181,6 +635,8 @@ def download_snapshot(repo_id, dest=None, revision="main", token=None, cache_dir
         kwargs = {
             "repo_id": repo_id,
             "revision": revision,
+            "max_workers": max_workers,
+            "etag_timeout": ETAG_TIMEOUT,
         }
 
         if token:
@@ -195,19 +651,59 @@ def download_snapshot(repo_id, dest=None, revision="main", token=None, cache_dir
             kwargs["local_dir"] = dest
             kwargs["local_dir_use_symlinks"] = False
 
-        # Download the snapshot
-        snapshot_path = snapshot_download(**kwargs)
+        # With patterns, resolve the commit and file list with a single request,
+        # filter client-side and fetch the matches pinned to that commit. File
+        # sizes are requested in the same call when they will be reported.
+        filenames = None
+        if allow_patterns or ignore_patterns:
+            commit_sha, siblings = _resolve_repo_files(
+                repo_id,
+                revision=revision,
+                token=token,
+                files_metadata=stat
+            )
+            siblings = _filter_paths(
+                siblings,
+                allow_patterns=allow_patterns,
+                ignore_patterns=ignore_patterns,
+                key=lambda sibling: sibling.rfilename
+            )
+            filenames = [sibling.rfilename for sibling in siblings]
+
+        # Download the snapshot. File timestamps come from a coarse kernel
+        # clock, so allow a second of slack when finding what was written.
+        started = time.time() - 1
+        if filenames:
+            snapshot_path, fetched = _download_files(
+                repo_id,
+                filenames,
+                commit_sha,
+                revision=revision,
+                token=token,
+                cache_dir=cache_dir,
+                local_dir=dest,
+                max_workers=max_workers
+            )
+        else:
+            snapshot_path = _with_retries(_load_hf().snapshot_download, **kwargs)
+            fetched = _files_modified_since(snapshot_path, started)
+
+        _release_page_cache(fetched)
 
-        # Count files and total size
-        total_size = 0
-        file_count = 0
-        if os.path.exists(snapshot_path):
-            for root, dirs, files in os.walk(snapshot_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if os.path.exists(file_path) and not os.path.islink(file_path):
-                        total_size += os.path.getsize(file_path)
-                        file_count += 1
+        # Count files and total size, only when requested
+        file_count, total_size = None, None
+        if stat and filenames:
+            file_count = len(siblings)
+            total_size = sum((sibling.size or 0) for sibling in siblings)
+        elif stat:
+            file_count, total_size = _snapshot_size(
+                repo_id,
+                snapshot_path,
+                revision=revision,
+                token=token,
+                allow_patterns=allow_patterns,
+                ignore_patterns=ignore_patterns
+            )
 
         send_complete({
             "snapshot_path": snapshot_path,
@@ -227,10 +723,130 @@ def download_snapshot(repo_id, dest=None, revision="main", token=None, cache_dir
         raise
 
 
+def _resolve_repo_files(repo_id, revision="main", token=None, files_metadata=False):
+    """
+    Resolve a revision to its commit SHA and list the repository's files.
+
+    A single repo_info request provides both, so every file can then be
+    downloaded from the same commit even if the branch moves meanwhile.
+    With files_metadata, the siblings also carry each file's size.
+
+    Returns:
+        Tuple of (commit_sha, list of RepoSibling)
+    """
+    api = _load_hf().HfApi(token=token)
+    info = _with_retries(api.repo_info, repo_id=repo_id, revision=revision, files_metadata=files_metadata)
+    return info.sha, list(info.siblings or [])
+
+
+def _compile_patterns(patterns):
+    """
+    Compile glob patterns into a single regex, or None if there are none.
+
+    As in huggingface_hub, a single string is one pattern and a pattern
+    ending in "/" matches everything under that directory.
+    """
+    if not patterns:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return re.compile("|".join(
+        fnmatch.translate(p + "*" if p.endswith("/") else p) for p in patterns
+    ))
+
+
+def _filter_paths(items, allow_patterns=None, ignore_patterns=None, key=None):
+    """
+    Keep items whose path matches any allow pattern and no ignore pattern.
+
+    Patterns are compiled once, so filtering is a single regex match per item
+    rather than one fnmatch call per item per pattern.
+    """
+    allow = _compile_patterns(allow_patterns)
+    ignore = _compile_patterns(ignore_patterns)
+    key = key or (lambda item: item)
+    return [
+        item for item in items
+        if (allow is None or allow.match(key(item))) and not (ignore and ignore.match(key(item)))
+    ]
+
+
+def _pattern_list(value):
+    """
+    argparse type for comma-separated glob patterns.
+
+    Strips whitespace and drops empty and duplicate entries; rejects a value
+    that contains no patterns at all.
+    """
+    patterns = list(dict.fromkeys(p.strip() for p in value.split(",") if p.strip()))
+    if not patterns:
+        raise argparse.ArgumentTypeError(f"no glob patterns in {value!r}")
+    return patterns
+
+
+def _download_files(repo_id, filenames, commit_sha, revision="main", token=None, cache_dir=None,
+                    local_dir=None, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Download the given files of one commit concurrently with hf_hub_download.
+
+    Pinning every download to commit_sha keeps the files consistent and lets
+    hf_hub_download skip the HEAD request for files already in the cache.
+
+    Returns:
+        Tuple of (root directory the files were downloaded into, i.e. local_dir
+        or the snapshot folder in the cache; paths of the files this call
+        actually wrote)
+    """
+    hf = _load_hf()
+    kwargs = {
+        "repo_id": repo_id,
+        "revision": commit_sha,
+        "etag_timeout": ETAG_TIMEOUT,
+    }
+
+    if token:
+        kwargs["token"] = token
+    if cache_dir:
+        kwargs["cache_dir"] = cache_dir
+    if local_dir:
+        kwargs["local_dir"] = local_dir
+        kwargs["local_dir_use_symlinks"] = False
+
+    storage_folder = os.path.join(
+        cache_dir or hf.constants.HF_HUB_CACHE,
+        hf.file_download.repo_folder_name(repo_id=repo_id, repo_type="model")
+    )
+    root = local_dir or os.path.join(storage_folder, "snapshots", commit_sha)
+
+    def download(filename):
+        before = _mtime_ns(os.path.join(root, filename))
+        file_path = _with_retries(hf.hf_hub_download, filename=filename, **kwargs)
+        return file_path if _mtime_ns(file_path) != before else None
+
+    # Fail fast: on the first error, drop queued downloads instead of letting
+    # them run to completion before the error surfaces
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(download, filename) for filename in filenames]
+        try:
+            fetched = [path for path in (future.result() for future in as_completed(futures)) if path]
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    # Point the requested ref at the commit, as snapshot_download does
+    if not local_dir and revision != commit_sha:
+        ref_path = os.path.join(storage_folder, "refs", revision)
+        os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+        with open(ref_path, "w") as f:
+            f.write(commit_sha)
+
+    return root, fetched
+
+
 def get_file_url(repo_id, filename, revision="main"):
     """Get the direct download URL for a file."""
     try:
-        url = hf_hub_url(repo_id, filename, revision=revision)
+        url = _cached_url(repo_id, filename, revision)
         send_complete({
             "url": url,
             "repo_id": repo_id,
@@ -250,6 +866,77 @@ def check_available():
     })
 
 
+# Commands accepted by --serve, keyed by their "action" field
+SERVE_ACTIONS = {
+    "download": download_single_file,
+    "snapshot": download_snapshot,
+    "url": get_file_url,
+    "check": check_available,
+}
+
+
+def dispatch(cmd, defaults=None):
+    """
+    Run a single --serve command.
+
+    Args:
+        cmd: Command object with an "action" key; remaining keys are passed as
+            keyword arguments to the matching function
+        defaults: Keyword arguments (e.g. token, cache_dir) applied when the
+            command omits them and the function accepts them
+    """
+    if not isinstance(cmd, dict):
+        send_error("Command must be a JSON object", "InvalidCommand")
+        return
+
+    params = dict(cmd)
+    action = params.pop("action", None)
+    handler = SERVE_ACTIONS.get(action)
+    if handler is None:
+        send_error(f"Unknown action: {action}", "InvalidCommand")
+        return
+
+    signature = inspect.signature(handler)
+    for name, value in (defaults or {}).items():
+        if name in signature.parameters and params.get(name) is None:
+            params[name] = value
+
+    try:
+        signature.bind(**params)
+    except TypeError as e:
+        send_error(f"Invalid arguments for {action}: {e}", "InvalidCommand")
+        return
+
+    try:
+        handler(**params)
+    except Exception:
+        # The handler already reported the failure as an error event
+        pass
+
+
+def serve(defaults=None):
+    """
+    Process newline-delimited JSON commands from stdin until EOF.
+
+    Keeps imports, the shared HTTP session and the metadata caches warm across
+    many requests instead of paying interpreter start-up for each one. Commands
+    run sequentially, so every event written belongs to the current command.
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            cmd = _loads(line)
+        except ValueError as e:
+            send_error(f"Invalid JSON command: {e}", "InvalidCommand")
+            continue
+
+        dispatch(cmd, defaults)
+        _save_manifests()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="HuggingFace Hub Download Wrapper",
@@ -268,11 +955,17 @@ Examples:
   # Download entire repository
   python hf_download.py --repo-id "gpt2" --snapshot --dest "./models/gpt2"
 
+  # Download entire repository with 16 parallel transfers
+  python hf_download.py --repo-id "gpt2" --snapshot --max-workers 16
+
   # Get download URL only
   python hf_download.py --repo-id "gpt2" --filename "config.json" --url-only
 
   # Check availability
   python hf_download.py --check
+
+  # Serve newline-delimited JSON commands on stdin
+  echo '{"action": "url", "repo_id": "gpt2", "filename": "config.json"}' | python hf_download.py --serve
         """
     )
 
@@ -280,13 +973,19 @@ Examples:
     parser.add_argument("--filename", help="File name to download")
     parser.add_argument("--dest", help="Destination directory")
     parser.add_argument("--revision", default="main", help="Git revision (default: main)")
-    parser.add_argument("--token", help="HuggingFace authentication token")
-    parser.add_argument("--cache-dir", help="Cache directory")
+    parser.add_argument("--token", default=os.environ.get("HF_TOKEN"),
+                        help="HuggingFace authentication token (default: $HF_TOKEN)")
+    parser.add_argument("--cache-dir", default=os.environ.get("HF_HUB_CACHE") or os.environ.get("HUGGINGFACE_HUB_CACHE"),
+                        help="Cache directory (default: $HF_HUB_CACHE or $HUGGINGFACE_HUB_CACHE)")
     parser.add_argument("--snapshot", action="store_true", help="Download entire repository snapshot")
-    parser.add_argument("--allow-patterns", help="Comma-separated glob patterns to include (for snapshot)")
-    parser.add_argument("--ignore-patterns", help="Comma-separated glob patterns to exclude (for snapshot)")
+    parser.add_argument("--allow-patterns", type=_pattern_list, help="Comma-separated glob patterns to include (for snapshot)")
+    parser.add_argument("--ignore-patterns", type=_pattern_list, help="Comma-separated glob patterns to exclude (for snapshot)")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"Concurrent file downloads (for snapshot, default: {DEFAULT_MAX_WORKERS})")
+    parser.add_argument("--stat", action="store_true", help="Report file count and total size (for snapshot)")
     parser.add_argument("--url-only", action="store_true", help="Only get the download URL")
     parser.add_argument("--check", action="store_true", help="Check if huggingface_hub is available")
+    parser.add_argument("--serve", action="store_true", help="Read JSON commands from stdin, one per line")
 
     args = parser.parse_args()
 
@@ -295,35 +994,33 @@ Examples:
         check_available()
         return 0
 
-    if not args.repo_id:
-        parser.error("--repo-id is required (unless using --check)")
-
-    # Get token from env if not provided
-    if not args.token:
-        args.token = os.environ.get("HF_TOKEN")
+    # Serve mode
+    if args.serve:
+        serve({"token": args.token, "cache_dir": args.cache_dir})
+        return 0
 
-    # Get cache dir from env if not provided
-    if not args.cache_dir:
-        args.cache_dir = os.environ.get("HF_HUB_CACHE") or os.environ.get("HUGGINGFACE_HUB_CACHE")
+    if not args.repo_id:
+        parser.error("--repo-id is required (unless using --check or --serve)")
 
     # URL-only mode
     if args.url_only:
         if not args.filename:
             parser.error("--filename is required for --url-only")
-        return get_file_url(args.repo_id, args.filename, args.revision)
+        get_file_url(args.repo_id, args.filename, args.revision)
+        return 0
 
     # Snapshot download
     if args.snapshot:
-        allow_patterns = args.allow_patterns.split(",") if args.allow_patterns else None
-        ignore_patterns = args.ignore_patterns.split(",") if args.ignore_patterns else None
         download_snapshot(
             args.repo_id,
             dest=args.dest,
             revision=args.revision,
             token=args.token,
             cache_dir=args.cache_dir,
-            allow_patterns=allow_patterns,
-            ignore_patterns=ignore_patterns
+            allow_patterns=args.allow_patterns,
+            ignore_patterns=args.ignore_patterns,
+            max_workers=args.max_workers,
+            stat=args.stat
         )
         return 0
 